@@ -5,7 +5,7 @@ Dataclasses used to represent song courses, branches, measures, and notes.
 import csv
 import os
 import struct
-from typing import Any, List, Dict, Tuple
+from typing import List, Dict, Tuple
 
 from dataclasses import dataclass, field, fields
 
@@ -15,6 +15,10 @@ from tja2fumen.constants import BRANCH_NAMES, TIMING_WINDOWS
 @dataclass()
 class TJAData:
     """Contains the information for a single note or single command."""
+    # NB: TJAData has no default values, so it can define `__slots__` without
+    # clashing with dataclass fields. This keeps the (very numerous) note
+    # objects small and avoids a per-instance `__dict__`.
+    __slots__ = ('name', 'value', 'pos')
     name: str
     value: str
     pos: int  # For TJAs, 'pos' is stored as an int rather than in milliseconds
@@ -222,6 +226,12 @@ class FumenMeasure:
                 self.branch_info[4:6] = vals
 
 
+# Precompiled structs for the 520-byte fumen header, keyed by byte order
+# ('<' or '>'): 108 floats for the timing windows, then 22 ints.
+FUMEN_HEADER_STRUCTS = {order: struct.Struct(order + "f"*108 + "i"*22)
+                        for order in "<>"}
+
+
 @dataclass()
 class FumenHeader:
     """Contains all the byte values for a Fumen chart file's header."""
@@ -253,43 +263,39 @@ class FumenHeader:
     def parse_header_values(self, raw_bytes: bytes) -> None:
         """Parse a raw string of 520 bytes to get the header values."""
         self._parse_order(raw_bytes)
-        raw = raw_bytes  # We use a shortened form just for visual clarity:
-        self.b000_b431_timing_windows          = self.unp(raw, "f"*108, 0, 431)
-        self.b432_b435_has_branches              = self.unp(raw, "i", 432, 435)
-        self.b436_b439_hp_max                    = self.unp(raw, "i", 436, 439)
-        self.b440_b443_hp_clear                  = self.unp(raw, "i", 440, 443)
-        self.b444_b447_hp_gain_good              = self.unp(raw, "i", 444, 447)
-        self.b448_b451_hp_gain_ok                = self.unp(raw, "i", 448, 451)
-        self.b452_b455_hp_loss_bad               = self.unp(raw, "i", 452, 455)
-        self.b456_b459_normal_normal_ratio       = self.unp(raw, "i", 456, 459)
-        self.b460_b463_normal_professional_ratio = self.unp(raw, "i", 460, 463)
-        self.b464_b467_normal_master_ratio       = self.unp(raw, "i", 464, 467)
-        self.b468_b471_branch_pts_good           = self.unp(raw, "i", 468, 471)
-        self.b472_b475_branch_pts_ok             = self.unp(raw, "i", 472, 475)
-        self.b476_b479_branch_pts_bad            = self.unp(raw, "i", 476, 479)
-        self.b480_b483_branch_pts_drumroll       = self.unp(raw, "i", 480, 483)
-        self.b484_b487_branch_pts_good_big       = self.unp(raw, "i", 484, 487)
-        self.b488_b491_branch_pts_ok_big         = self.unp(raw, "i", 488, 491)
-        self.b492_b495_branch_pts_drumroll_big   = self.unp(raw, "i", 492, 495)
-        self.b496_b499_branch_pts_balloon        = self.unp(raw, "i", 496, 499)
-        self.b500_b503_branch_pts_kusudama       = self.unp(raw, "i", 500, 503)
-        self.b504_b507_branch_pts_unknown        = self.unp(raw, "i", 504, 507)
-        self.b508_b511_dummy_data                = self.unp(raw, "i", 508, 511)
-        self.b512_b515_number_of_measures        = self.unp(raw, "i", 512, 515)
-        self.b516_b519_unknown_data              = self.unp(raw, "i", 516, 519)
-
-    def unp(self, raw_bytes: bytes, fmt: str, start: int, end: int) -> Any:
-        """Unpack a raw byte string according to specific types."""
-        vals = struct.unpack(self.order + fmt, raw_bytes[start:end+1])
-        return vals[0] if len(vals) == 1 else vals
+        # Unpack the whole header at once, then assign values to each field
+        vals = FUMEN_HEADER_STRUCTS[self.order].unpack_from(raw_bytes)
+        self.b000_b431_timing_windows            = vals[0:108]
+        self.b432_b435_has_branches              = vals[108]
+        self.b436_b439_hp_max                    = vals[109]
+        self.b440_b443_hp_clear                  = vals[110]
+        self.b444_b447_hp_gain_good              = vals[111]
+        self.b448_b451_hp_gain_ok                = vals[112]
+        self.b452_b455_hp_loss_bad               = vals[113]
+        self.b456_b459_normal_normal_ratio       = vals[114]
+        self.b460_b463_normal_professional_ratio = vals[115]
+        self.b464_b467_normal_master_ratio       = vals[116]
+        self.b468_b471_branch_pts_good           = vals[117]
+        self.b472_b475_branch_pts_ok             = vals[118]
+        self.b476_b479_branch_pts_bad            = vals[119]
+        self.b480_b483_branch_pts_drumroll       = vals[120]
+        self.b484_b487_branch_pts_good_big       = vals[121]
+        self.b488_b491_branch_pts_ok_big         = vals[122]
+        self.b492_b495_branch_pts_drumroll_big   = vals[123]
+        self.b496_b499_branch_pts_balloon        = vals[124]
+        self.b500_b503_branch_pts_kusudama       = vals[125]
+        self.b504_b507_branch_pts_unknown        = vals[126]
+        self.b508_b511_dummy_data                = vals[127]
+        self.b512_b515_number_of_measures        = vals[128]
+        self.b516_b519_unknown_data              = vals[129]
 
     def _parse_order(self, raw_bytes: bytes) -> None:
         """Parse the order of the song (little or big endian)."""
-        self.order = ''
         # Bytes 512-515 are the number of measures. We check the values using
         # both little and big endian, then compare to see which is correct.
-        if (self.unp(raw_bytes, ">I", 512, 515) <
-                self.unp(raw_bytes, "<I", 512, 515)):
+        measures_bytes = raw_bytes[512:516]
+        if (int.from_bytes(measures_bytes, "big") <
+                int.from_bytes(measures_bytes, "little")):
             self.order = ">"
         else:
             self.order = "<"
@@ -28,6 +28,30 @@ TJA_NOTE_TYPES = {
     'I': 'Drumroll',  # green roll
 }
 
+# Names of the events created by TJA commands, along with the event's value
+# (`None` means that the value is taken from the command itself)
+TJA_COMMAND_EVENTS = {
+    'GOGOSTART':    ('gogo', '1'),
+    'GOGOEND':      ('gogo', '0'),
+    'BARLINEON':    ('barline', '1'),
+    'BARLINEOFF':   ('barline', '0'),
+    'DELAY':        ('delay', None),
+    'SCROLL':       ('scroll', None),
+    'BPMCHANGE':    ('bpm', None),
+    'MEASURE':      ('measure', None),
+    'LEVELHOLD':    ('levelhold', None),
+    'SENOTECHANGE': ('senote', None),
+    'SECTION':      ('section', None),
+    'BRANCHSTART':  ('branch_start', None),
+}
+
+# Branch selected by each of the TJA branch commands ('#N', '#E', '#M')
+TJA_BRANCH_COMMANDS = {
+    'N': 'normal',
+    'E': 'professional',
+    'M': 'master',
+}
+
 # Conversion for TJAPlayer3's #SENOTECHANGE command
 SENOTECHANGE_TYPES = {
     1: "Don",   # ドン
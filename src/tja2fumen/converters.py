@@ -4,6 +4,7 @@ Functions for converting TJA song data to Fumen song data.
 
 import re
 import warnings
+from collections import deque
 from typing import List, Dict, Tuple, Union
 
 from tja2fumen.classes import (TJACourse, TJAMeasure, TJAMeasureProcessed,
@@ -11,6 +12,9 @@ from tja2fumen.classes import (TJACourse, TJAMeasure, TJAMeasureProcessed,
                                FumenNote)
 from tja2fumen.constants import BRANCH_NAMES, SENOTECHANGE_TYPES
 
+# Precompiled pattern for the time signature values of `#MEASURE` commands
+TJA_MEASURE_PATTERN = re.compile(r"(\d+)/(\d+)")
+
 
 def process_commands(tja_branches: Dict[str, List[TJAMeasure]], bpm: float) \
                                 -> Dict[str, List[TJAMeasureProcessed]]:
@@ -83,7 +87,7 @@ def process_commands(tja_branches: Dict[str, List[TJAMeasure]], bpm: float) \
                     current_barline = bool(int(data.value))
                     measure_tja_processed.barline = current_barline
                 elif data.name == 'measure':
-                    match_measure = re.match(r"(\d+)/(\d+)", data.value)
+                    match_measure = TJA_MEASURE_PATTERN.match(data.value)
                     if not match_measure:
                         continue
                     current_dividend = int(match_measure.group(1))
@@ -96,7 +100,7 @@ def process_commands(tja_branches: Dict[str, List[TJAMeasure]], bpm: float) \
                 # to BPM/SCROLL/GOGO, then the measure will actually be split
                 # into two small submeasures. So, we need to start a new
                 # measure in those cases.)
-                elif data.name in ['bpm', 'scroll', 'gogo', 'senote']:
+                elif data.name in {'bpm', 'scroll', 'gogo', 'senote'}:
                     # Parse the values
                     new_val: Union[bool, float, str]
                     if data.name == 'bpm':
@@ -204,8 +208,8 @@ def convert_tja_to_fumen(tja: TJACourse) -> FumenCourse:
         len(b) for b in tja_branches_processed.values()
     ))
 
-    # Use a single copy of the course balloons (since we use .pop())
-    course_balloons = tja.balloon.copy()
+    # Use a single copy of the course balloons (since we use .popleft())
+    course_balloons = deque(tja.balloon)
 
     # Iterate through the different branches in the TJA
     total_notes = {'normal': 0, 'professional': 0, 'master': 0}
@@ -349,11 +353,11 @@ def convert_tja_to_fumen(tja: TJACourse) -> FumenCourse:
                 note.score_diff = tja.score_diff
 
                 # Handle drumroll-specific note metadata
-                if note.note_type in ["Drumroll", "DRUMROLL"]:
+                if note.note_type in {"Drumroll", "DRUMROLL"}:
                     current_drumroll = note
-                elif note.note_type in ["Balloon", "Kusudama"]:
+                elif note.note_type in {"Balloon", "Kusudama"}:
                     try:
-                        note.hits = course_balloons.pop(0)
+                        note.hits = course_balloons.popleft()
                     except IndexError:
                         warnings.warn(f"Not enough values for 'BALLOON:' "
                                       f"({tja.balloon}). Using value=1 to "
@@ -367,9 +371,9 @@ def convert_tja_to_fumen(tja: TJACourse) -> FumenCourse:
                     total_notes[current_branch] += 1
 
                 # Track branch points (to later compute `#BRANCHSTART p` vals)
-                if note.note_type in ['Don', 'Ka']:
+                if note.note_type in {'Don', 'Ka'}:
                     pts_to_add = fumen.header.b468_b471_branch_pts_good
-                elif note.note_type in ['DON', 'KA']:
+                elif note.note_type in {'DON', 'KA'}:
                     pts_to_add = fumen.header.b484_b487_branch_pts_good_big
                 elif note.note_type == 'Balloon':
                     pts_to_add = fumen.header.b496_b499_branch_pts_balloon
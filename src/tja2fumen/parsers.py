@@ -2,36 +2,43 @@
 Functions for parsing TJA files (.tja) and Fumen files (.bin)
 """
 
-import os
 import re
 import struct
 import warnings
-from copy import deepcopy
-from typing import BinaryIO, Any, List, Dict, Tuple
+from collections import deque
+from copy import copy
+from dataclasses import replace
+from typing import Any, List, Dict, Tuple
 
 from tja2fumen.classes import (TJASong, TJACourse, TJAMeasure, TJAData,
                                FumenCourse, FumenMeasure, FumenBranch,
                                FumenNote, FumenHeader)
 from tja2fumen.constants import (NORMALIZE_COURSE, COURSE_NAMES, BRANCH_NAMES,
                                  TJA_COURSE_NAMES, TJA_NOTE_TYPES,
+                                 TJA_COMMAND_EVENTS, TJA_BRANCH_COMMANDS,
                                  FUMEN_NOTE_TYPES)
 
 ###############################################################################
 #                          TJA-parsing functions                              #
 ###############################################################################
 
+# Precompiled patterns for TJA command ('#NAME value') lines
+TJA_START_PATTERN = re.compile(r"^#START(?:\s+(.+))?")
+TJA_COMMAND_PATTERN = re.compile(r"^#([a-zA-Z0-9]+)(?:\s+(.+))?")
+
 
 def parse_tja(fname_tja: str) -> TJASong:
     """Read in lines of a .tja file and load them into a TJASong object."""
+    # Read the file once, then try each encoding on the same bytes
+    with open(fname_tja, "rb") as tja_file:
+        tja_bytes = tja_file.read()
     try:
-        with open(fname_tja, "r", encoding="utf-8-sig") as tja_file:
-            tja_text = tja_file.read()
+        tja_text = tja_bytes.decode("utf-8-sig")
     except UnicodeDecodeError:
-        with open(fname_tja, "r", encoding="shift-jis") as tja_file:
-            tja_text = tja_file.read()
+        tja_text = tja_bytes.decode("shift-jis")
 
-    tja_lines = [line for line in tja_text.splitlines() if line.strip() != '']
-    tja = split_tja_lines_into_courses(tja_lines)
+    # (Blank lines are dropped along with comments when splitting courses.)
+    tja = split_tja_lines_into_courses(tja_text.splitlines())
     for course in tja.courses.values():
         branches, balloon_data = parse_tja_course_data(course.data)
         course.branches = branches
@@ -67,8 +74,9 @@ def split_tja_lines_into_courses(lines: List[str]) -> TJASong:
     `parse_tja_course_data()` function.
     """
     # Strip leading/trailing whitespace and comments ('// Comment')
-    lines = [line.split("//")[0].strip() for line in lines
-             if line.split("//")[0].strip()]
+    # (Each line is stripped once, then empty results are dropped.)
+    lines = [line for line in (raw.partition("//")[0].strip() for raw in lines)
+             if line]
 
     # Initialize song with BPM and OFFSET global metadata
     tja_metadata = {}
@@ -91,23 +99,38 @@ def split_tja_lines_into_courses(lines: List[str]) -> TJASong:
 
     current_course = ''
     current_course_basename = ''
+    # Alias for `parsed_tja.courses[current_course].data` (the list that data
+    # lines are appended to), re-bound whenever `current_course` changes
+    current_course_data: List[str] = []
     for line in lines:
         # Only metadata and #START commands are relevant for this function
-        match_metadata = re.match(r"^([a-zA-Z0-9]+):(.*)", line)
-        match_start = re.match(r"^#START(?:\s+(.+))?", line)
+        # (Commands always start with '#', and metadata never does, so only
+        #  one of the two ever needs to be checked for each line. Metadata
+        #  is 'NAME:value', where NAME is ASCII letters/digits only, which
+        #  can be checked without a regex by splitting on the first ':'.)
+        is_command = line.startswith("#")
+        metadata_name, separator, metadata_value = (
+            ('', '', '') if is_command else line.partition(':')
+        )
+        is_metadata = (bool(separator) and metadata_name.isascii()
+                       and metadata_name.isalnum())
+        match_start = (TJA_START_PATTERN.match(line) if is_command
+                       else None)
 
         # Case 1: Metadata lines
-        if match_metadata:
-            name_upper = match_metadata.group(1).upper()
-            value = match_metadata.group(2).strip()
+        if is_metadata:
+            name_upper = metadata_name.upper()
+            value = metadata_value.strip()
 
             # Course-specific metadata fields
             if name_upper == 'COURSE':
                 value = value.lower().capitalize()  # coerce hard/HARD -> Hard
-                if value not in NORMALIZE_COURSE:
+                normalized_course = NORMALIZE_COURSE.get(value)
+                if normalized_course is None:
                     raise ValueError(f"Invalid COURSE value: '{value}'")
-                current_course = NORMALIZE_COURSE[value]
+                current_course = normalized_course
                 current_course_basename = current_course
+                current_course_data = parsed_tja.courses[current_course].data
             elif name_upper == 'LEVEL':
                 if not value.isdigit():
                     raise ValueError(f"Invalid LEVEL value: '{value}'")
@@ -127,8 +150,10 @@ def split_tja_lines_into_courses(lines: List[str]) -> TJASong:
             elif name_upper == 'STYLE':
                 # Reset the course name to remove "P1/P2" that may have been
                 # added by a previous STYLE:DOUBLE chart
-                if value == 'Single':
+                if value == 'Single' and current_course_basename:
                     current_course = current_course_basename
+                    current_course_data = \
+                        parsed_tja.courses[current_course].data
             else:
                 pass  # Ignore 'TITLE', 'SUBTITLE', 'WAVE', etc.
 
@@ -137,15 +162,18 @@ def split_tja_lines_into_courses(lines: List[str]) -> TJASong:
             value = match_start.group(1) if match_start.group(1) else ''
             # For STYLE:Double, #START P1/P2 indicates the start of a new
             # chart. But, we want multiplayer charts to inherit the
-            # metadata from the course as a whole, so we deepcopy the
-            # existing course for that difficulty.
-            if value in ["1P", "2P"]:
+            # metadata from the course as a whole, so we copy the existing
+            # course for that difficulty. (Only the metadata is copied: the
+            # new chart starts with its own empty `data`/`branches`.)
+            if value in {"1P", "2P"}:
                 value = value[1] + value[0]  # Fix user typo (e.g. 1P -> P1)
-            if value in ["P1", "P2"]:
+            if value in {"P1", "P2"}:
                 current_course = current_course_basename + value
-                parsed_tja.courses[current_course] = \
-                    deepcopy(parsed_tja.courses[current_course_basename])
-                parsed_tja.courses[current_course].data = []
+                course_base = parsed_tja.courses[current_course_basename]
+                parsed_tja.courses[current_course] = replace(
+                    course_base, data=[], branches={}
+                )
+                current_course_data = parsed_tja.courses[current_course].data
             elif value:
                 raise ValueError(f"Invalid value '{value}' for #START.")
 
@@ -155,7 +183,7 @@ def split_tja_lines_into_courses(lines: List[str]) -> TJASong:
         # Case 3: For other commands and data, simply copy as-is (parse later)
         else:
             if current_course:
-                parsed_tja.courses[current_course].data.append(line)
+                current_course_data.append(line)
             else:
                 warnings.warn(f"Data encountered before first COURSE: "
                               f"'{line}' (Check for typos in TJA)")
@@ -163,11 +191,13 @@ def split_tja_lines_into_courses(lines: List[str]) -> TJASong:
     # If a .tja has "STYLE: Double" but no "STYLE: Single", then it will be
     # missing data for the "single player" chart. To fix this, we copy over
     # the P1 chart from "STYLE: Double" to fill the "STYLE: Single" role.
+    # (A shallow copy is enough: the copied `data` is only read from here on,
+    #  and parsing assigns each course its own new `branches` and `balloon`.)
     for course_name in COURSE_NAMES:
         course_single_player = parsed_tja.courses[course_name]
         course_player_one = parsed_tja.courses[course_name+"P1"]
         if course_player_one.data and not course_single_player.data:
-            parsed_tja.courses[course_name] = deepcopy(course_player_one)
+            parsed_tja.courses[course_name] = copy(course_player_one)
 
     # Remove any charts (e.g. P1/P2) not present in the TJA file (empty data)
     for course_name in [k for k, v in parsed_tja.courses.items()
@@ -210,6 +240,9 @@ def parse_tja_course_data(data: List[str]) \
     parsed_branches = {k: [TJAMeasure()] for k in BRANCH_NAMES}
     has_branches = bool([d for d in data if d.startswith('#BRANCH')])
     current_branch = 'all' if has_branches else 'normal'
+    # The branches written to by the current line. (This is updated alongside
+    # `current_branch`, rather than being recomputed for every line.)
+    target_branches = BRANCH_NAMES if has_branches else ('normal',)
     branch_condition = ''
     # keep track of balloons in order to fix the 'BALLOON' field value
     balloons: Dict[str, List[str]] = {k: [] for k in BRANCH_NAMES}
@@ -220,7 +253,9 @@ def parse_tja_course_data(data: List[str]) \
     for idx_l, line in enumerate(data):
         # 0. Check to see whether line is a command or note data
         command, name, value, note_data = '', '', '', ''
-        match_command = re.match(r"^#([a-zA-Z0-9]+)(?:\s+(.+))?", line)
+        # (Commands always start with '#', so only run the regex for those.)
+        match_command = (TJA_COMMAND_PATTERN.match(line)
+                         if line.startswith('#') else None)
         if match_command:
             command = match_command.group(1).upper()
             if match_command.group(2):
@@ -230,88 +265,60 @@ def parse_tja_course_data(data: List[str]) \
 
         # 1. Parse measure notes
         if note_data:
-            notes_to_write: str = ""
             # If measure has ended, then add notes to the current measure,
             # then start a new measure by incrementing idx_m
             if note_data.endswith(','):
-                for branch_name in (BRANCH_NAMES if current_branch == 'all'
-                                    else [current_branch]):
+                notes_to_write = note_data[:-1]
+                for branch_name in target_branches:
                     check_branch_length(parsed_branches, branch_name,
                                         expected_len=idx_m+1)
-                    notes_to_write = note_data[:-1]
                     parsed_branches[branch_name][idx_m].notes += notes_to_write
                     parsed_branches[branch_name].append(TJAMeasure())
                 idx_m += 1
             # Otherwise, keep adding notes to the current measure ('idx_m')
             else:
-                for branch_name in (BRANCH_NAMES if current_branch == 'all'
-                                    else [current_branch]):
-                    notes_to_write = note_data
+                notes_to_write = note_data
+                for branch_name in target_branches:
                     parsed_branches[branch_name][idx_m].notes += notes_to_write
 
             # Keep track of balloon notes that were added
-            balloon_notes = [n for n in notes_to_write if n in ['7', '9']]
+            balloon_notes = [n for n in notes_to_write if n in {'7', '9'}]
             # mark balloon notes as duplicates if necessary. this will be used
             # to fix the BALLOON: field to account for duplicated balloons.
             balloon_notes = (['DUPE'] * len(balloon_notes)
                              if current_branch == 'all' else balloon_notes)
-            for branch_name in (BRANCH_NAMES if current_branch == 'all'
-                                else [current_branch]):
+            for branch_name in target_branches:
                 balloons[branch_name].extend(balloon_notes)
 
         # 2. Parse measure commands that produce an "event"
-        elif command in ['GOGOSTART', 'GOGOEND', 'BARLINEON', 'BARLINEOFF',
-                         'DELAY', 'SCROLL', 'BPMCHANGE', 'MEASURE',
-                         'LEVELHOLD', 'SENOTECHANGE', 'SECTION',
-                         'BRANCHSTART']:
-            # Get position of the event
-            pos = 0
-            for branch_name in (BRANCH_NAMES if current_branch == 'all'
-                                else [current_branch]):
+        elif command in TJA_COMMAND_EVENTS:
+            # Get position of the event (i.e. the number of notes written so
+            # far to the current measure of the last branch being written to)
+            for branch_name in target_branches:
                 check_branch_length(parsed_branches, branch_name,
                                     expected_len=idx_m+1)
-                pos = len(parsed_branches[branch_name][idx_m].notes)
-
-            # Parse event type
-            if command == 'GOGOSTART':
-                name, value = 'gogo', '1'
-            elif command == 'GOGOEND':
-                name, value = 'gogo', '0'
-            elif command == 'BARLINEON':
-                name, value = 'barline', '1'
-            elif command == 'BARLINEOFF':
-                name, value = 'barline', '0'
-            elif command == 'DELAY':
-                name = 'delay'
-            elif command == 'SCROLL':
-                name = 'scroll'
-            elif command == 'BPMCHANGE':
-                name = 'bpm'
-            elif command == 'MEASURE':
-                name = 'measure'
-            elif command == 'LEVELHOLD':
-                name = 'levelhold'
-            elif command == "SENOTECHANGE":
-                name = 'senote'
-            elif command == 'SECTION':
+            pos = len(parsed_branches[target_branches[-1]][idx_m].notes)
+
+            # Parse event type (and value, for commands that don't have one)
+            name, fixed_value = TJA_COMMAND_EVENTS[command]
+            if fixed_value is not None:
+                value = fixed_value
+            if command == 'SECTION':
                 # If #SECTION occurs before a #BRANCHSTART, then ensure that
                 # it's present on every branch. Otherwise, #SECTION will only
                 # be present on the current branch, and so the `branch_info`
                 # values won't be correctly set for the other two branches.
                 if data[idx_l+1].startswith('#BRANCHSTART'):
-                    name = 'section'
-                    current_branch = 'all'
+                    current_branch, target_branches = 'all', BRANCH_NAMES
                 elif not branch_condition:
-                    name = 'section'
-                    current_branch = 'all'
+                    current_branch, target_branches = 'all', BRANCH_NAMES
                 # Otherwise, #SECTION exists in isolation. In this case, to
                 # reset the accuracy, we just repeat the previous #BRANCHSTART.
                 else:
                     name, value = 'branch_start', branch_condition
             elif command == 'BRANCHSTART':
                 # Ensure that the #BRANCHSTART command is added to all branches
-                current_branch = 'all'
-                name = 'branch_start'
+                current_branch, target_branches = 'all', BRANCH_NAMES
                 branch_condition = value
                 # If a branch was intentionally excluded by the charter,
                 # make sure to copy measures from the longest branch.
@@ -321,8 +328,7 @@ def parse_tja_course_data(data: List[str]) \
                 idx_m_branchstart = idx_m
 
             # Append event to the current measure's events
-            for branch_name in (BRANCH_NAMES if current_branch == 'all'
-                                else [current_branch]):
+            for branch_name in target_branches:
                 check_branch_length(parsed_branches, branch_name,
                                     expected_len=idx_m+1)
                 parsed_branches[branch_name][idx_m].events.append(
@@ -334,30 +340,23 @@ def parse_tja_course_data(data: List[str]) \
         else:
             if command in ('START', 'END'):
                 current_branch = 'all' if has_branches else 'normal'
-            elif command == 'N':
-                current_branch = 'normal'
-                idx_m = idx_m_branchstart
-            elif command == 'E':
-                current_branch = 'professional'
-                idx_m = idx_m_branchstart
-            elif command == 'M':
-                current_branch = 'master'
+                target_branches = (BRANCH_NAMES if has_branches
+                                   else ('normal',))
+            elif command in TJA_BRANCH_COMMANDS:
+                current_branch = TJA_BRANCH_COMMANDS[command]
+                target_branches = (current_branch,)
                 idx_m = idx_m_branchstart
             elif command == 'BRANCHEND':
-                current_branch = 'all'
+                current_branch, target_branches = 'all', BRANCH_NAMES
 
             else:
                 warnings.warn(f"Ignoring unsupported command '{command}'")
 
     # Delete the last measure in the branch if no notes or events
     # were added to it (due to preallocating empty measures)
-    deleted_branches = False
     for branch in parsed_branches.values():
         if not branch[-1].notes and not branch[-1].events:
             del branch[-1]
-            deleted_branches = True
-    if deleted_branches:
-        idx_m -= 1
 
     # Equalize branch lengths to account for missing branches
     for branch_name, branch in parsed_branches.items():
@@ -367,29 +366,38 @@ def parse_tja_course_data(data: List[str]) \
     # Merge measure data and measure events in chronological order
     for branch_name, branch in parsed_branches.items():
         for measure in branch:
-            # warn the user if their measure have typos
-            valid_notes = []
+            # Look up each note's type once, skipping blank notes. Invalid
+            # notes (typos) don't count towards the position of later notes.
+            notes = []
+            pos = 0
             for note in measure.notes:
-                if note not in TJA_NOTE_TYPES:
+                note_type = TJA_NOTE_TYPES.get(note)
+                if note_type is None:
+                    # warn the user if their measure have typos
                     warnings.warn(f"Ignoring invalid note '{note}' in measure "
                                   f"'{''.join(measure.notes)}' (check for "
                                   f"typos in TJA)")
-                else:
-                    valid_notes.append(note)
-            notes = [TJAData(name='note', value=TJA_NOTE_TYPES[note], pos=i)
-                     for i, note in enumerate(valid_notes) if
-                     TJA_NOTE_TYPES[note] != 'Blank']
+                    continue
+                if note_type != 'Blank':
+                    notes.append(TJAData(name='note', value=note_type,
+                                         pos=pos))
+                pos += 1
             events = measure.events
-            while notes or events:
-                if events and notes:
-                    if notes[0].pos >= events[0].pos:
-                        measure.combined.append(events.pop(0))
-                    else:
-                        measure.combined.append(notes.pop(0))
-                elif events:
-                    measure.combined.append(events.pop(0))
-                elif notes:
-                    measure.combined.append(notes.pop(0))
+            # Walk both lists with a cursor each (rather than `pop(0)`, which
+            # shifts the entire list every time it's called)
+            i_n, i_e = 0, 0
+            while i_n < len(notes) and i_e < len(events):
+                if notes[i_n].pos >= events[i_e].pos:
+                    measure.combined.append(events[i_e])
+                    i_e += 1
+                else:
+                    measure.combined.append(notes[i_n])
+                    i_n += 1
+            measure.combined.extend(events[i_e:])
+            measure.combined.extend(notes[i_n:])
+            # The events now live in `combined`. (Measures may be shared
+            # between branches, so don't merge the same events twice.)
+            events.clear()
 
     # Ensure all branches have the same number of measures
     if has_branches:
@@ -530,6 +538,8 @@ def fix_balloon_field(balloon_field: List[int],
     # the "hits" value is present across all branches.
     duplicated_balloons = []
     balloon_field_fixed = []
+    # Consume the balloon values from the front, without modifying the input
+    balloon_values = deque(balloon_field)
 
     # Handle the normal branch first
     # If balloons are duplicated, then it's probably going to be from 'normal'
@@ -539,19 +549,19 @@ def fix_balloon_field(balloon_field: List[int],
     #        But, this is such a rare case that I'm alright handling it
     #        incorrectly. If a user files a bug report, then I'll fix it then.
     for balloon_note in balloon_data['normal']:
-        balloon_hits = balloon_field.pop(0)
+        balloon_hits = balloon_values.popleft()
         if balloon_note == 'DUPE':
             duplicated_balloons.append(balloon_hits)
         balloon_field_fixed.append(balloon_hits)
 
     # Repeat any duplicated balloon notes for the professional/master branches
     for branch_name in ['professional', 'master']:
-        dupes_to_copy = duplicated_balloons.copy()
+        dupes_to_copy = deque(duplicated_balloons)
         for balloon_note in balloon_data[branch_name]:
             if balloon_note == 'DUPE':
-                balloon_field_fixed.append(dupes_to_copy.pop(0))
+                balloon_field_fixed.append(dupes_to_copy.popleft())
             else:
-                balloon_field_fixed.append(balloon_field.pop(0))
+                balloon_field_fixed.append(balloon_values.popleft())
 
     return balloon_field_fixed
 
@@ -560,6 +570,16 @@ def fix_balloon_field(balloon_field: List[int],
 #                          Fumen-parsing functions                            #
 ###############################################################################
 
+# Precompiled structs for the fixed-size fumen records, keyed by byte order
+# ('<' or '>'). See `parse_fumen` for a breakdown of each format string.
+FUMEN_MEASURE_STRUCTS = {order: struct.Struct(order + "ffBBHiiiiiii")
+                         for order in "<>"}
+FUMEN_BRANCH_STRUCTS = {order: struct.Struct(order + "HHf")
+                        for order in "<>"}
+FUMEN_NOTE_STRUCTS = {order: struct.Struct(order + "ififHHf")
+                      for order in "<>"}
+
+
 def parse_fumen(fumen_file: str,
                 exclude_empty_measures: bool = False) -> FumenCourse:
     """
@@ -587,102 +607,108 @@ def parse_fumen(fumen_file: str,
     └─ ...
     """
     with open(fumen_file, "rb") as file:
-        size = os.fstat(file.fileno()).st_size
-
-        header = FumenHeader()
-        header.parse_header_values(file.read(520))
-        song = FumenCourse(header=header)
+        fumen_bytes = file.read()
+    size = len(fumen_bytes)
+
+    header = FumenHeader()
+    header.parse_header_values(fumen_bytes[:520])
+    song = FumenCourse(header=header)
+    measure_format = FUMEN_MEASURE_STRUCTS[song.header.order]
+    branch_format = FUMEN_BRANCH_STRUCTS[song.header.order]
+    note_format = FUMEN_NOTE_STRUCTS[song.header.order]
+
+    # Rather than issuing many small reads, we parse the in-memory file
+    # contents by keeping track of the current byte offset ourselves.
+    offset = 520
+    for _ in range(song.header.b512_b515_number_of_measures):
+        # Parse the measure data using the following `format_string`:
+        #   "ffBBHiiiiiii" (12 format characters, 40 bytes per measure)
+        #     - 'f': BPM               (one float (4 bytes))
+        #     - 'f': fumenOffset       (one float (4 bytes))
+        #     - 'B': gogo              (one unsigned char (1 byte))
+        #     - 'B': barline           (one unsigned char (1 byte))
+        #     - 'H': <padding>         (one unsigned short (2 bytes))
+        #     - 'iiiiii': branch_info  (six integers (24 bytes))
+        #     - 'i': <padding>         (one integer (4 bytes)
+        measure_struct, offset = read_struct(fumen_bytes, offset,
+                                             measure_format)
+
+        # Create the measure dictionary using the newly-parsed measure data
+        measure = FumenMeasure(
+            bpm=measure_struct[0],
+            offset_start=measure_struct[1],
+            gogo=bool(measure_struct[2]),
+            barline=bool(measure_struct[3]),
+            padding1=measure_struct[4],
+            branch_info=list(measure_struct[5:11]),
+            padding2=measure_struct[11]
+        )
 
-        for _ in range(song.header.b512_b515_number_of_measures):
+        # Iterate through the three branch types
+        for branch_name in BRANCH_NAMES:
             # Parse the measure data using the following `format_string`:
-            #   "ffBBHiiiiiii" (12 format characters, 40 bytes per measure)
-            #     - 'f': BPM               (one float (4 bytes))
-            #     - 'f': fumenOffset       (one float (4 bytes))
-            #     - 'B': gogo              (one unsigned char (1 byte))
-            #     - 'B': barline           (one unsigned char (1 byte))
-            #     - 'H': <padding>         (one unsigned short (2 bytes))
-            #     - 'iiiiii': branch_info  (six integers (24 bytes))
-            #     - 'i': <padding>         (one integer (4 bytes)
-            measure_struct = read_struct(file, song.header.order,
-                                         format_string="ffBBHiiiiiii")
-
-            # Create the measure dictionary using the newly-parsed measure data
-            measure = FumenMeasure(
-                bpm=measure_struct[0],
-                offset_start=measure_struct[1],
-                gogo=bool(measure_struct[2]),
-                barline=bool(measure_struct[3]),
-                padding1=measure_struct[4],
-                branch_info=list(measure_struct[5:11]),
-                padding2=measure_struct[11]
+            #   "HHf" (3 format characters, 8 bytes per branch)
+            #     - 'H': total_notes ( one unsigned short (2 bytes))
+            #     - 'H': <padding>  ( one unsigned short (2 bytes))
+            #     - 'f': speed      ( one float (4 bytes)
+            branch_struct, offset = read_struct(fumen_bytes, offset,
+                                                branch_format)
+
+            # Create the branch dictionary using newly-parsed branch data
+            total_notes = branch_struct[0]
+            branch = FumenBranch(
+                length=total_notes,
+                padding=branch_struct[1],
+                speed=branch_struct[2],
             )
 
-            # Iterate through the three branch types
-            for branch_name in BRANCH_NAMES:
-                # Parse the measure data using the following `format_string`:
-                #   "HHf" (3 format characters, 8 bytes per branch)
-                #     - 'H': total_notes ( one unsigned short (2 bytes))
-                #     - 'H': <padding>  ( one unsigned short (2 bytes))
-                #     - 'f': speed      ( one float (4 bytes)
-                branch_struct = read_struct(file, song.header.order,
-                                            format_string="HHf")
-
-                # Create the branch dictionary using newly-parsed branch data
-                total_notes = branch_struct[0]
-                branch = FumenBranch(
-                    length=total_notes,
-                    padding=branch_struct[1],
-                    speed=branch_struct[2],
+            # Iterate through each note in the measure (per branch)
+            for _ in range(total_notes):
+                # Parse the note data using the following `format_string`:
+                #   "ififHHf" (7 format characters, 24b per note cluster)
+                #     - 'i': note type
+                #     - 'f': note position
+                #     - 'i': item
+                #     - 'f': <padding>
+                #     - 'H': score_init
+                #     - 'H': score_diff
+                #     - 'f': duration
+                note_struct, offset = read_struct(fumen_bytes, offset,
+                                                  note_format)
+
+                # Create the note dictionary using newly-parsed note data
+                note_type = note_struct[0]
+                note = FumenNote(
+                    note_type=FUMEN_NOTE_TYPES[note_type],
+                    pos=note_struct[1],
+                    item=note_struct[2],
+                    padding=note_struct[3],
+                    duration=note_struct[6],  # Drumroll/balloon duration
                 )
 
-                # Iterate through each note in the measure (per branch)
-                for _ in range(total_notes):
-                    # Parse the note data using the following `format_string`:
-                    #   "ififHHf" (7 format characters, 24b per note cluster)
-                    #     - 'i': note type
-                    #     - 'f': note position
-                    #     - 'i': item
-                    #     - 'f': <padding>
-                    #     - 'H': score_init
-                    #     - 'H': score_diff
-                    #     - 'f': duration
-                    note_struct = read_struct(file, song.header.order,
-                                              format_string="ififHHf")
-
-                    # Create the note dictionary using newly-parsed note data
-                    note_type = note_struct[0]
-                    note = FumenNote(
-                        note_type=FUMEN_NOTE_TYPES[note_type],
-                        pos=note_struct[1],
-                        item=note_struct[2],
-                        padding=note_struct[3],
-                    )
-
-                    if note_type in (0xa, 0xc):
-                        # Balloon hits
-                        note.hits = note_struct[4]
-                        note.hits_padding = note_struct[5]
-                    else:
-                        song.score_init = note.score_init = note_struct[4]
-                        song.score_diff = note.score_diff = note_struct[5] // 4
-
-                    # Drumroll/balloon duration
-                    note.duration = note_struct[6]
-
-                    # Account for padding at the end of drumrolls
-                    if note_type in (0x6, 0x9, 0x62):
-                        note.drumroll_bytes = file.read(8)
-
-                    # Assign the note to the branch
-                    branch.notes.append(note)
-
-                # Assign the branch to the measure
-                measure.branches[branch_name] = branch
-
-            # Assign the measure to the song
-            song.measures.append(measure)
-            if file.tell() >= size:
-                break
+                if note_type in {0xa, 0xc}:
+                    # Balloon hits
+                    note.hits = note_struct[4]
+                    note.hits_padding = note_struct[5]
+                else:
+                    song.score_init = note.score_init = note_struct[4]
+                    song.score_diff = note.score_diff = note_struct[5] // 4
+
+                # Account for padding at the end of drumrolls
+                if note_type in {0x6, 0x9, 0x62}:
+                    note.drumroll_bytes = fumen_bytes[offset:offset+8]
+                    offset += 8
+
+                # Assign the note to the branch
+                branch.notes.append(note)
+
+            # Assign the branch to the measure
+            measure.branches[branch_name] = branch
+
+        # Assign the measure to the song
+        song.measures.append(measure)
+        if offset >= size:
+            break
 
     # NB: Official fumens often include empty measures as a way of inserting
     # barlines for visual effect. But, TJA authors tend not to add these empty
@@ -699,29 +725,32 @@ def parse_fumen(fumen_file: str,
     return song
 
 
-def read_struct(file: BinaryIO,
-                order: str,
-                format_string: str) -> Tuple[Any, ...]:
+def read_struct(fumen_bytes: bytes,
+                offset: int,
+                struct_format: struct.Struct) -> Tuple[Tuple[Any, ...], int]:
     """
     Interpret bytes as packed binary data.
 
     Arguments:
-        - file: The fumen's file object (presumably in 'rb' mode).
-        - order: '<' or '>' (little or big endian).
-        - format_string: String made up of format characters that describes
-                         the data layout. Full list of available characters:
+        - fumen_bytes: The full contents of the fumen file.
+        - offset: The position within `fumen_bytes` to start unpacking from.
+        - struct_format: A precompiled `struct.Struct` whose format string
+                         (including the '<' or '>' byte order) describes the
+                         data layout. Full list of available characters:
           (https://docs.python.org/3/library/struct.html#format-characters)
-        - seek: The position of the read pointer to be used within the file.
 
     Return values:
         - interpreted_string: A string containing interpreted byte values,
-                              based on the specified 'fmt' format characters.
+                              based on the struct's format characters.
+        - offset: The position immediately following the unpacked bytes.
     """
-    expected_size = struct.calcsize(order + format_string)
-    byte_string = file.read(expected_size)
+    expected_size = struct_format.size
     # One "official" fumen (AC11\deo\deo_n.bin) runs out of data early
     # This workaround fixes the issue by appending 0's to get the size to match
-    if len(byte_string) != expected_size:
+    if offset + expected_size > len(fumen_bytes):
+        byte_string = fumen_bytes[offset:offset+expected_size]
         byte_string += (b'\x00' * (expected_size - len(byte_string)))
-    interpreted_string = struct.unpack(order + format_string, byte_string)
-    return interpreted_string
+        interpreted_string = struct_format.unpack(byte_string)
+    else:
+        interpreted_string = struct_format.unpack_from(fumen_bytes, offset)
+    return interpreted_string, offset + expected_size